@@ -14,8 +14,10 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with uanti. If not, see <http://www.gnu.org/licenses/>.
 
+from .batch import Batch
 from .client import Gerrit
 
 __all__ = [
+    "Batch",
     "Gerrit",
 ]
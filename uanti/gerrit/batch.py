@@ -0,0 +1,96 @@
+# Copyright 2023 You-Sheng Yang
+
+# This file is part of uanti.
+#
+# uanti is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Lesser General Public License as published by the Free
+# Software Foundation, version 3 of the License.
+#
+# uanti is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with uanti. If not, see <http://www.gnu.org/licenses/>.
+
+"""Concurrent dispatch of independent requests."""
+
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from concurrent.futures import ThreadPoolExecutor
+
+from uanti.restful.mixins import (
+    GetMixin,
+    GetWithoutIdMixin,
+    ListFromDictMixin,
+    ListMixin,
+)
+
+
+__all__ = [
+    "Batch",
+]
+
+
+class Batch:
+    """Collects manager calls and runs them concurrently.
+
+    Calls are queued with :meth:`get` and :meth:`list`, and dispatched by
+    :meth:`execute` on a thread pool sharing the client's HTTP session, so
+    the network latency of independent queries overlaps::
+
+        batch = Batch()
+        batch.list(gerrit.changes, q="status:open")
+        batch.get(gerrit.projects, "gerrit")
+        open_changes, project = batch.execute()
+    """
+
+    def __init__(self) -> None:
+        self._calls: List[
+            Tuple[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]
+        ] = []
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def get(
+        self,
+        manager: Union[GetMixin, GetWithoutIdMixin],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        """Queue a ``manager.get(*args, **kwargs)`` call."""
+        self._calls.append((manager.get, args, kwargs))
+
+    def list(
+        self, manager: Union[ListMixin, ListFromDictMixin], **kwargs: Any
+    ) -> None:
+        """Queue a ``manager.list(**kwargs)`` call."""
+        self._calls.append((manager.list, (), kwargs))
+
+    def execute(self, max_workers: int = 10) -> List[Any]:
+        """Run all queued calls and empty the queue.
+
+        Args:
+            max_workers: Maximum number of requests in flight. Keep it
+                within the connection pool size of the client so that
+                connections are reused rather than discarded.
+
+        Returns:
+            The result of each call, in the order the calls were queued.
+
+        Raises:
+            The exception of the first queued call that failed, after all
+            calls have completed.
+        """
+        calls, self._calls = self._calls, []
+        if not calls:
+            return []
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(func, *args, **kwargs)
+                for func, args, kwargs in calls
+            ]
+        return [future.result() for future in futures]
@@ -18,17 +18,18 @@
 
 from typing import Any, Dict, Optional, Union
 
-import json
 from requests.auth import AuthBase
 import requests
 
 from uanti.restful.auth import HTTPBasicAuthFromNetrc
 from uanti.restful.client import RestfulClient
+from uanti.restful import utils
 from uanti.gerrit import const
 from uanti.gerrit import objects
 
 
-GERRIT_MAGIC_JSON_PREFIX = ")]}'\n"
+GERRIT_MAGIC_JSON_PREFIX = b")]}'\n"
+GERRIT_MAGIC_JSON_PREFIX_LEN = len(GERRIT_MAGIC_JSON_PREFIX)
 
 
 class Gerrit(RestfulClient):
@@ -45,6 +46,15 @@ class Gerrit(RestfulClient):
         retry_transient_errors: Whether to retry after 500, 502, 503, 504
             or 52x responses. Defaults to False.
         session: The http session to use.
+        pool_size: Number of connections per host kept alive for reuse by
+            the http session created when ``session`` is not given.
+        etag_cache_size: Number of GET responses carrying an ``ETag`` or
+            ``Last-Modified`` header to keep for revalidation. Defaults to
+            0, which disables the cache.
+        max_backoff: Upper bound, in seconds, of the wait between retries
+            when the server does not say how long to wait. Defaults to 60.
+        coalesce_gets: Whether identical GET requests made concurrently
+            are sent only once. Defaults to False.
     """
 
     def __init__(
@@ -56,6 +66,10 @@ class Gerrit(RestfulClient):
         user_agent: str = None,
         retry_transient_errors: bool = False,
         session: Optional[requests.Session] = None,
+        pool_size: int = 32,
+        etag_cache_size: int = 0,
+        max_backoff: float = 60.0,
+        coalesce_gets: bool = False,
     ) -> None:
         if not auth:
             try:
@@ -73,9 +87,13 @@ class Gerrit(RestfulClient):
             user_agent,
             retry_transient_errors,
             session,
+            pool_size=pool_size,
+            etag_cache_size=etag_cache_size,
+            max_backoff=max_backoff,
+            coalesce_gets=coalesce_gets,
         )
 
-        self._headers["Accept"] = "application/json"
+        self._set_default_header("Accept", "application/json")
 
         self.access = objects.AccessRestfulManager(self)
         self.accounts = objects.AccountsRestfulManager(self)
@@ -97,13 +115,13 @@ class Gerrit(RestfulClient):
             code.
 
         """
-        content = response.content.strip()
-        if response.encoding:
-            content = content.decode(response.encoding)
-        if not content:
-            return content
+        # Gerrit puts its magic prefix at the very start of the body, and the
+        # parsers skip any surrounding whitespace themselves, so the body is
+        # not stripped.
+        content = response.content
+        if not content or content.isspace():
+            return ""
         if content.startswith(GERRIT_MAGIC_JSON_PREFIX):
-            index = len(GERRIT_MAGIC_JSON_PREFIX)
-            content = content[index:]
+            content = content[GERRIT_MAGIC_JSON_PREFIX_LEN:]
 
-        return json.loads(content)
+        return utils.json_loads(content)
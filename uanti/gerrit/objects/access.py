@@ -18,7 +18,6 @@ from typing import Any, List
 
 from uanti.restful.base import RestfulObject, RestfulManager
 from uanti.restful.mixins import ListFromDictMixin
-from uanti.restful import exceptions as exc
 
 
 __all__ = [
@@ -29,13 +28,16 @@ __all__ = [
 
 
 class ProjectAccess(RestfulObject):
-    pass
+    __slots__ = ()
 
 
 class AccessRestfulManager(ListFromDictMixin, RestfulManager):
+    __slots__ = ()
+
     _path = "/access/"
     _obj_cls = ProjectAccess
 
-    @exc.on_http_error(exc.RestfulListError)
     def list(self, **kwargs: Any) -> List[RestfulObject]:
-        super().list(copy_id_attr="id", **kwargs)
+        # ListFromDictMixin.list() already translates HTTP errors into
+        # RestfulListError.
+        return super().list(copy_id_attr="id", **kwargs)
@@ -34,6 +34,8 @@ __all__ = [
 
 
 class Account(RestfulObject):
+    __slots__ = ()
+
     _id_attr = "_account_id"
 
     def __init__(
@@ -42,8 +44,7 @@ class Account(RestfulObject):
         attrs: Dict[str, Any],
     ) -> None:
         # Remove additional mark from server query changes result
-        if "_more_accounts" in attrs:
-            attrs.pop("_more_accounts")
+        attrs.pop("_more_accounts", None)
 
         super().__init__(manager, attrs)
 
@@ -51,6 +52,8 @@ class Account(RestfulObject):
 class AccountsRestfulManager(
     CreateMixin, DeleteMixin, GetMixin, ListMixin, RestfulManager
 ):
+    __slots__ = ()
+
     _path = "/accounts/"
     _obj_cls = Account
     _create_attrs = RequiredOptional(
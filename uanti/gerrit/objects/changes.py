@@ -16,8 +16,7 @@
 
 from typing import Any, Dict, Optional
 
-import urllib.parse
-
+from uanti.restful import utils
 from uanti.restful.base import RestfulObject, RestfulManager
 from uanti.restful.mixins import (
     CreateMixin,
@@ -40,6 +39,8 @@ __all__ = [
 
 
 class ChangesMetaDiff(RestfulObject):
+    __slots__ = ()
+
     _id_attr: None
 
     def __init__(
@@ -47,19 +48,16 @@ class ChangesMetaDiff(RestfulObject):
         manager: "RestfulManager",
         attrs: Dict[str, Any],
     ) -> None:
-        super().__init__(manager, attrs)
+        changes = manager._client.changes
+        for attr in ("old_change_info", "new_change_info"):
+            attrs[attr] = Change(changes, attrs[attr])
 
-        self.__dict__["_attrs"]["old_change_info"] = Change(
-            self._manager._client.changes,
-            self.__dict__["_attrs"]["old_change_info"],
-        )
-        self.__dict__["_attrs"]["new_change_info"] = Change(
-            self._manager._client.changes,
-            self.__dict__["_attrs"]["new_change_info"],
-        )
+        super().__init__(manager, attrs)
 
 
 class ChangesMetaDiffRestfulManager(GetWithoutIdMixin, RestfulManager):
+    __slots__ = ()
+
     _path = "/changes/{change_id}/meta_diff"
     _obj_cls = ChangesMetaDiff
     _from_parent_attrs = {"change_id": "id"}
@@ -95,6 +93,8 @@ class ChangesMetaDiffRestfulManager(GetWithoutIdMixin, RestfulManager):
 
 
 class Change(RestfulObject):
+    __slots__ = ("meta_diff",)
+
     meta_diff: ChangesMetaDiffRestfulManager
 
     def __init__(
@@ -103,10 +103,9 @@ class Change(RestfulObject):
         attrs: Dict[str, Any],
     ) -> None:
         # id string returned from server is encoded, so decode it first
-        attrs["id"] = urllib.parse.unquote(attrs["id"])
+        attrs["id"] = utils.unquote_id(attrs["id"])
         # Remove additional mark from server query changes result
-        if "_more_changes" in attrs:
-            attrs.pop("_more_changes")
+        attrs.pop("_more_changes", None)
 
         super().__init__(manager, attrs)
 
@@ -114,6 +113,8 @@ class Change(RestfulObject):
 class ChangesRestfulManager(
     CreateMixin, DeleteMixin, GetMixin, ListMixin, RestfulManager
 ):
+    __slots__ = ()
+
     _path = "/changes/"
     _obj_cls = Change
     _create_attrs = RequiredOptional(
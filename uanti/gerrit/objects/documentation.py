@@ -26,9 +26,13 @@ __all__ = [
 
 
 class DocResult(RestfulObject):
+    __slots__ = ()
+
     _id_attr = None
 
 
 class DocumentationRestfulManager(ListMixin, RestfulManager):
+    __slots__ = ()
+
     _path = "/Documentation/"
     _obj_cls = DocResult
@@ -16,8 +16,7 @@
 
 from typing import Any, Dict
 
-import urllib.parse
-
+from uanti.restful import utils
 from uanti.restful.base import RestfulObject, RestfulManager
 from uanti.restful.mixins import (
     CreateMixin,
@@ -36,6 +35,8 @@ __all__ = [
 
 
 class Group(RestfulObject):
+    __slots__ = ()
+
     def __init__(
         self,
         manager: "RestfulManager",
@@ -43,10 +44,9 @@ class Group(RestfulObject):
     ) -> None:
         # id, owner_id strings returned from server is encoded
         for attr in ("id", "owner_id"):
-            attrs[attr] = urllib.parse.unquote(attrs[attr])
+            attrs[attr] = utils.unquote_id(attrs[attr])
         # Remove additional mark from server query changes result
-        if "_more_groups" in attrs:
-            attrs.pop("_more_groups")
+        attrs.pop("_more_groups", None)
 
         super().__init__(manager, attrs)
 
@@ -54,6 +54,8 @@ class Group(RestfulObject):
 class GroupsRestfulManager(
     CreateMixin, DeleteMixin, GetMixin, ListMixin, RestfulManager
 ):
+    __slots__ = ()
+
     _path = "/groups/"
     _obj_cls = Group
     _create_attrs = RequiredOptional(
@@ -26,9 +26,11 @@ __all__ = [
 
 
 class Plugin(RestfulObject):
-    pass
+    __slots__ = ()
 
 
 class PluginsRestfulManager(ListMixin, RestfulManager):
+    __slots__ = ()
+
     _path = "/plugins/"
     _obj_cls = Plugin
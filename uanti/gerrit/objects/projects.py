@@ -16,8 +16,7 @@
 
 from typing import Any, Dict
 
-import urllib.parse
-
+from uanti.restful import utils
 from uanti.restful.base import RestfulObject, RestfulManager
 from uanti.restful.mixins import CreateMixin, GetMixin, ListFromDictMixin
 from uanti.restful.types import RequiredOptional
@@ -31,13 +30,15 @@ __all__ = [
 
 
 class Project(RestfulObject):
+    __slots__ = ()
+
     def __init__(
         self,
         manager: "RestfulManager",
         attrs: Dict[str, Any],
     ) -> None:
         # id string returned from server is encoded, so decode it first
-        attrs["id"] = urllib.parse.unquote(attrs["id"])
+        attrs["id"] = utils.unquote_id(attrs["id"])
 
         super().__init__(manager, attrs)
 
@@ -48,6 +49,8 @@ class ProjectsRestfulManager(
     ListFromDictMixin,
     RestfulManager,
 ):
+    __slots__ = ()
+
     _path = "/projects/"
     _obj_cls = Project
     _create_attrs = RequiredOptional(
@@ -38,6 +38,8 @@
 
 """Authentication handlers."""
 
+import functools
+
 from requests.auth import HTTPDigestAuth, HTTPBasicAuth
 from requests.utils import get_netrc_auth
 
@@ -48,7 +50,10 @@ __all__ = [
 ]
 
 
+@functools.lru_cache(maxsize=32)
 def _get_netrc_auth(url):
+    # Avoid locating and parsing the netrc file again for every client
+    # created against the same server.
     return get_netrc_auth(url)
 
 
@@ -15,14 +15,20 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with uanti. If not, see <http://www.gnu.org/licenses/>.
 
-import importlib
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+    Type,
+    TYPE_CHECKING,
+    Union,
+)
 
-from types import ModuleType
-from typing import Any, Dict, Iterable, Optional, Type, TYPE_CHECKING, Union
-
-import copy
 import json
-import pprint
+import sys
 
 from .client import RestfulClient
 from .types import RequiredOptional
@@ -34,6 +40,19 @@ __all__ = [
     "RestfulManager",
 ]
 
+# Marks a missing dict entry, as server attributes may legitimately be None
+_MISSING = object()
+
+
+def _copy_value(value: Any) -> Any:
+    # Server data is decoded JSON, so only dicts and lists are mutable; any
+    # other value, including nested RestfulObjects, is shared.
+    if isinstance(value, dict):
+        return {k: _copy_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_value(v) for v in value]
+    return value
+
 
 class RestfulObject:
     """Represents an object built from server data.
@@ -48,15 +67,32 @@ class RestfulObject:
     Likewise, you can define a ``_repr_attr`` in subclasses to specify which
     attribute should be added as a human-readable identifier when called in the
     object's ``__repr__()`` method.
+
+    Attributes annotated with a ``*RestfulManager`` class get an instance of
+    that manager, created on first access.
+
+    Instances have no ``__dict__``. Subclasses should declare ``__slots__``
+    as well, listing the attributes annotated as managers (if any), to keep
+    it that way.
     """
 
+    __slots__ = (
+        "__weakref__",
+        "_attrs",
+        "_manager",
+        "_parent_attrs",
+        "_updated_attrs",
+    )
+
     _id_attr: Optional[str] = "id"
     _attrs: Dict[str, Any]
-    _module: ModuleType
     _parent_attrs: Dict[str, Any]
     _repr_attr: Optional[str] = None
     _updated_attrs: Dict[str, Any]
     _manager: "RestfulManager"
+    _manager_fields: ClassVar[
+        Optional[Tuple[Tuple[str, Type["RestfulManager"]], ...]]
+    ]
 
     def __init__(
         self,
@@ -69,23 +105,20 @@ class RestfulObject:
                 f"value: {attrs!r}\nThis likely indicates an incorrect or "
                 f"malformed server response."
             )
-        self.__dict__.update(
-            {
-                "_manager": manager,
-                "_attrs": attrs,
-                "_updated_attrs": {},
-                "_module": importlib.import_module(self.__module__),
-            }
-        )
-        self.__dict__["_parent_attrs"] = self._manager.parent_attrs
-        self._create_managers()
+        # Since we have our own __setattr__ method, we can't use setattr()
+        object.__setattr__(self, "_manager", manager)
+        object.__setattr__(self, "_attrs", attrs)
+        object.__setattr__(self, "_updated_attrs", {})
+        object.__setattr__(self, "_parent_attrs", manager.parent_attrs)
 
     def __getattr__(self, name: str) -> Any:
-        if name in self.__dict__["_updated_attrs"]:
-            return self.__dict__["_updated_attrs"][name]
+        updated_attrs = self._updated_attrs
+        value = updated_attrs.get(name, _MISSING)
+        if value is not _MISSING:
+            return value
 
-        if name in self.__dict__["_attrs"]:
-            value = self.__dict__["_attrs"][name]
+        value = self._attrs.get(name, _MISSING)
+        if value is not _MISSING:
             # If the value is a list, we copy it in the _updated_attrs dict
             # because we are not able to detect changes made on the object
             # (append, insert, pop, ...). Without forcing the attr
@@ -97,27 +130,42 @@ class RestfulObject:
             # note: _parent_attrs will only store simple values (int) so we
             # don't make this check in the next block.
             if isinstance(value, list):
-                self.__dict__["_updated_attrs"][name] = value[:]
-                return self.__dict__["_updated_attrs"][name]
+                value = updated_attrs[name] = value[:]
 
             return value
 
-        if name in self.__dict__["_parent_attrs"]:
-            return self.__dict__["_parent_attrs"][name]
+        value = self._parent_attrs.get(name, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # Sub-managers are only created when first used, so that objects
+        # built in bulk by list() don't pay for them. Once set, the
+        # attribute is found directly and __getattr__ is no longer called.
+        for attr, manager_cls in self._get_manager_fields():
+            if attr == name:
+                manager = manager_cls(self._manager._client, parent=self)
+                # Since we have our own __setattr__ method, we can't use
+                # setattr()
+                object.__setattr__(self, attr, manager)
+                return manager
 
         message = f"{type(self).__name__!r} object has no attribute {name!r}"
         raise AttributeError(message)
 
     def __setattr__(self, name: str, value: Any) -> None:
-        self.__dict__["_updated_attrs"][name] = value
+        self._updated_attrs[name] = value
 
-    def asdict(self, *, with_parent_attrs: bool = False) -> Dict[str, Any]:
-        data = {}
+    def _merged_attrs(self, with_parent_attrs: bool) -> Dict[str, Any]:
         if with_parent_attrs:
-            data.update(copy.deepcopy(self._parent_attrs))
-        data.update(copy.deepcopy(self._attrs))
-        data.update(copy.deepcopy(self._updated_attrs))
-        return data
+            return {
+                **self._parent_attrs,
+                **self._attrs,
+                **self._updated_attrs,
+            }
+        return {**self._attrs, **self._updated_attrs}
+
+    def asdict(self, *, with_parent_attrs: bool = False) -> Dict[str, Any]:
+        return _copy_value(self._merged_attrs(with_parent_attrs))
 
     @property
     def attributes(self) -> Dict[str, Any]:
@@ -126,93 +174,132 @@ class RestfulObject:
     def to_json(
         self, *, with_parent_attrs: bool = False, **kwargs: Any
     ) -> str:
-        return json.dumps(
-            self.asdict(with_parent_attrs=with_parent_attrs), **kwargs
-        )
+        # json.dumps() never modifies its input, so no copy is needed
+        return json.dumps(self._merged_attrs(with_parent_attrs), **kwargs)
 
     def __str__(self) -> str:
         return f"{type(self)} => {self.asdict()}"
 
     def pformat(self) -> str:
-        return f"{type(self)} => \n{pprint.pformat(self.asdict())}"
+        # Server data is JSON, so an indented dump formats it as well as
+        # pprint does at a fraction of the cost. Anything else (e.g. nested
+        # objects) falls back to str().
+        data = json.dumps(
+            self._merged_attrs(False),
+            indent=2,
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+        )
+        return f"{type(self)} => \n{data}"
 
     def pprint(self) -> None:
         print(self.pformat())
 
     def __repr__(self) -> str:
         name = self.__class__.__name__
+        repr_value = self._repr_value
 
-        if (self._id_attr and self._repr_value) and (
-            self._id_attr != self._repr_attr
-        ):
-            return (
-                f"<{name} {self._id_attr}:{self.get_id()} "
-                f"{self._repr_attr}:{self._repr_value}>"
-            )
         if self._id_attr:
-            return f"<{name} {self._id_attr}:{self.get_id()}>"
-        if self._repr_value:
-            return f"<{name} {self._repr_attr}:{self._repr_value}>"
+            id_value = self.get_id()
+            if repr_value and self._id_attr != self._repr_attr:
+                return (
+                    f"<{name} {self._id_attr}:{id_value} "
+                    f"{self._repr_attr}:{repr_value}>"
+                )
+            return f"<{name} {self._id_attr}:{id_value}>"
+        if repr_value:
+            return f"<{name} {self._repr_attr}:{repr_value}>"
 
         return f"<{name}>"
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, RestfulObject):
             return NotImplemented
-        if self.get_id() and other.get_id():
-            return self.get_id() == other.get_id()
+        self_id, other_id = self.get_id(), other.get_id()
+        if self_id and other_id:
+            return self_id == other_id
         return super() == other
 
     def __ne__(self, other: object) -> bool:
         if not isinstance(other, RestfulObject):
             return NotImplemented
-        if self.get_id() and other.get_id():
-            return self.get_id() != other.get_id()
+        self_id, other_id = self.get_id(), other.get_id()
+        if self_id and other_id:
+            return self_id != other_id
         return super() != other
 
     def __dir__(self) -> Iterable[str]:
-        return set(self.attributes).union(super().__dir__())
+        # Only the names are needed, so combine the key views rather than
+        # copying every value through self.attributes.
+        return (
+            self._parent_attrs.keys()
+            | self._attrs.keys()
+            | self._updated_attrs.keys()
+            | set(super().__dir__())
+        )
 
     def __hash__(self) -> int:
-        if not self.get_id():
+        id_val = self.get_id()
+        if not id_val:
             return super().__hash__()
-        return hash(self.get_id())
-
-    def _create_managers(self) -> None:
+        return hash(id_val)
+
+    @classmethod
+    def _get_manager_fields(
+        cls,
+    ) -> Tuple[Tuple[str, Type["RestfulManager"]], ...]:
+        # Resolved once per class. Look into the class' own __dict__ so the
+        # result cached on a base class is never picked up by subclasses.
+        fields = cls.__dict__.get("_manager_fields")
+        if fields is not None:
+            return fields
+
+        resolved: Dict[str, Type["RestfulManager"]] = {}
         # NOTE(jlvillal): We are creating our managers by looking at the class
         # annotations. If an attribute is annotated as being a *Manager type
         # then we create the manager and assign it to the attribute.
-        for attr, annotation in sorted(self.__annotations__.items()):
-            # We ignore creating a manager for the '_manager' attribute as that
-            # is done in the self.__init__() method
-            if attr in ("_manager",):
-                continue
-            if not isinstance(annotation, (type, str)):
-                continue
-            if isinstance(annotation, type):
-                cls_name = annotation.__name__
-            else:
-                cls_name = annotation
-            # All *Manager classes are used except for the base
-            # "RestfulManager" class
-            if cls_name == "RestfulManager" or not cls_name.endswith(
-                "RestfulManager"
-            ):
+        # Annotations are read from each class of the MRO, as only Python
+        # before 3.10 lets a class without annotations expose its parent's.
+        for klass in reversed(cls.__mro__):
+            annotations = klass.__dict__.get("__annotations__", {})
+            if not annotations:
                 continue
-            cls = getattr(self._module, cls_name)
-            manager = cls(self._manager._client, parent=self)
-            # Since we have our own __setattr__ method, we can't use setattr()
-            self.__dict__[attr] = manager
+            # The module defining the class is necessarily loaded already
+            module = sys.modules[klass.__module__]
+            for attr, annotation in annotations.items():
+                # We ignore creating a manager for the '_manager' attribute as
+                # that is set in the self.__init__() method
+                if attr in ("_manager",):
+                    continue
+                if not isinstance(annotation, (type, str)):
+                    continue
+                if isinstance(annotation, type):
+                    cls_name = annotation.__name__
+                else:
+                    cls_name = annotation
+                # All *Manager classes are used except for the base
+                # "RestfulManager" class
+                if cls_name == "RestfulManager" or not cls_name.endswith(
+                    "RestfulManager"
+                ):
+                    continue
+                resolved[attr] = getattr(module, cls_name)
+
+        fields = tuple(resolved.items())
+        cls._manager_fields = fields
+        return fields
 
     def _update_attrs(self, new_attrs: Dict[str, Any]) -> None:
-        self.__dict__["_updated_attrs"] = {}
-        self.__dict__["_attrs"] = new_attrs
+        object.__setattr__(self, "_updated_attrs", {})
+        object.__setattr__(self, "_attrs", new_attrs)
 
     def get_id(self) -> Optional[Union[int, str]]:
         """Returns the id of the resource."""
-        if self._id_attr is None or not hasattr(self, self._id_attr):
+        if self._id_attr is None:
             return None
-        id_val = getattr(self, self._id_attr)
+        # A single lookup: hasattr() would go through __getattr__ twice
+        id_val = getattr(self, self._id_attr, None)
         if TYPE_CHECKING:
             assert id_val is None or isinstance(id_val, (int, str))
         return id_val
@@ -220,9 +307,9 @@ class RestfulObject:
     @property
     def _repr_value(self) -> Optional[str]:
         """Safely returns the human-readable resource name if present."""
-        if self._repr_attr is None or not hasattr(self, self._repr_attr):
+        if self._repr_attr is None:
             return None
-        repr_val = getattr(self, self._repr_attr)
+        repr_val = getattr(self, self._repr_attr, None)
         if TYPE_CHECKING:
             assert isinstance(repr_val, str)
         return repr_val
@@ -235,8 +322,20 @@ class RestfulManager:
 
     ``_path``: Base URL path on which requests will be sent (e.g. '/projects')
     ``_obj_cls``: The class of objects that will be created
+
+    Like objects, managers have no ``__dict__`` as long as derived classes
+    declare ``__slots__`` too.
     """
 
+    __slots__ = (
+        "__weakref__",
+        "_client",
+        "_computed_path",
+        "_parent",
+        "_parent_attrs",
+        "_stripped_path",
+    )
+
     _create_attrs: RequiredOptional = RequiredOptional()
     _update_attrs: RequiredOptional = RequiredOptional()
     _path: Optional[str] = None
@@ -246,6 +345,7 @@ class RestfulManager:
     _computed_path: Optional[str]
     _parent: Optional[RestfulObject]
     _parent_attrs: Dict[str, Any]
+    _stripped_path: Optional[str]
     _client: RestfulClient
 
     def __init__(
@@ -261,6 +361,12 @@ class RestfulManager:
         self._client = client
         self._parent = parent  # for nested managers
         self._computed_path = self._compute_path()
+        # Base for the paths of single objects, without its trailing slash
+        self._stripped_path = (
+            None
+            if self._computed_path is None
+            else self._computed_path.rstrip("/")
+        )
 
     @property
     def parent_attrs(self) -> Optional[Dict[str, Any]]:
@@ -277,10 +383,13 @@ class RestfulManager:
 
         data: Dict[str, Optional[EncodedId]] = {}
         for self_attr, parent_attr in self._from_parent_attrs.items():
-            if not hasattr(self._parent, parent_attr):
+            value = getattr(self._parent, parent_attr, _MISSING)
+            if value is _MISSING:
                 data[self_attr] = None
                 continue
-            data[self_attr] = EncodedId(getattr(self._parent, parent_attr))
+            if TYPE_CHECKING:
+                assert isinstance(value, (str, int))
+            data[self_attr] = EncodedId(value)
         self._parent_attrs = data
         return path.format(**data)
 
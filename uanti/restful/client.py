@@ -22,12 +22,26 @@ __all__ = [
     "RestfulClient",
 ]
 
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING, Union
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
 
+from concurrent.futures import Future, ThreadPoolExecutor
+import random
+import threading
 import time
 
 from urllib import parse
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import AuthBase
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 
@@ -45,7 +59,22 @@ REDIRECT_MSG = (
     "{source!r} to {target!r}"
 )
 
-RETRYABLE_TRANSIENT_ERROR_CODES = [500, 502, 503, 504] + list(range(520, 531))
+RETRYABLE_TRANSIENT_ERROR_CODES = frozenset(
+    [500, 502, 503, 504, *range(520, 531)]
+)
+
+# Exponential backoff schedule in seconds, indexed by retry count and capped
+# at one minute. Retries past the end of the table reuse its last entry.
+_BACKOFF: Tuple[float, ...] = tuple(
+    min(60.0, 0.1 * (1 << i)) for i in range(16)
+)
+
+
+def _is_json(result: requests.Response) -> bool:
+    """Returns whether the body of result is declared as JSON."""
+    content_type = result.headers.get("Content-Type", "")
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type == "application/json"
 
 
 class RestfulClient:
@@ -62,6 +91,20 @@ class RestfulClient:
         retry_transient_errors: Whether to retry after 500, 502, 503, 504
             or 52x responses. Defaults to False.
         session: The http session to use.
+        pool_size: Number of connections per host kept alive for reuse by
+            the http session created when ``session`` is not given. A
+            session passed in by the caller is used as configured.
+        etag_cache_size: Number of GET responses carrying an ``ETag`` or
+            ``Last-Modified`` header to keep for revalidation. Later
+            identical GETs send ``If-None-Match`` or ``If-Modified-Since``
+            and reuse the kept body when the server answers 304 Not
+            Modified. Defaults to 0, which disables the cache.
+        max_backoff: Upper bound, in seconds, of the wait between retries
+            when the server does not say how long to wait. Defaults to 60.
+        coalesce_gets: Whether identical GET requests made concurrently
+            from several threads are sent only once, sharing the response.
+            A write made meanwhile by another thread may then not be seen
+            by a GET started after it. Defaults to False.
     """
 
     def __init__(
@@ -73,14 +116,50 @@ class RestfulClient:
         user_agent: str = DEFAULT_USER_AGENT,
         retry_transient_errors: bool = False,
         session: Optional[requests.Session] = None,
+        pool_size: int = 20,
+        etag_cache_size: int = 0,
+        max_backoff: float = 60.0,
+        coalesce_gets: bool = False,
     ) -> None:
         self._url = url.rstrip("/")
         self._auth = auth
         self._ssl_verify = ssl_verify
         self._timeout = timeout
-        self._headers = {"User-Agent": user_agent}
         self._retry_transient_errors = retry_transient_errors
-        self._session = session or requests.Session()
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_size
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self._session = session
+        # Headers sent with every request when they cannot be set on the
+        # session, see _set_default_header().
+        self._headers: Dict[str, str] = {}
+        self._set_default_header("User-Agent", user_agent)
+        self._etag_cache = (
+            utils.LRUCache(etag_cache_size) if etag_cache_size > 0 else None
+        )
+        self._max_backoff = max_backoff
+        self._coalesce_gets = coalesce_gets
+        # Futures of the GET requests currently on the wire, by cache key
+        self._inflight: Dict[Hashable, "Future[requests.Response]"] = {}
+        self._inflight_lock = threading.Lock()
+
+    def _set_default_header(self, name: str, value: str) -> None:
+        """Sets a header sent with every request.
+
+        The header is stored on the http session when the client created
+        it, and requests merges it into each request by itself. A session
+        passed in by the caller is never modified: the header is sent with
+        each request instead.
+        """
+        if self._owns_session:
+            self._session.headers[name] = value
+        else:
+            self._headers[name] = value
 
     def __enter__(self) -> "RestfulClient":
         return self
@@ -97,10 +176,20 @@ class RestfulClient:
         Returns:
             The full URL
         """
-        if path.startswith("http://") or path.startswith("https://"):
+        if path.startswith(("http://", "https://")):
             return path
         return f"{self._url}{path}"
 
+    def _backoff(self, retries: int) -> float:
+        """Returns the wait time before the given retry.
+
+        The wait grows exponentially with the number of retries and is
+        randomized by +/-50% so that concurrent clients do not retry in
+        lockstep.
+        """
+        wait_time = _BACKOFF[min(retries, len(_BACKOFF) - 1)]
+        return min(wait_time * random.uniform(0.5, 1.5), self._max_backoff)
+
     @staticmethod
     def _check_redirects(result: requests.Response) -> None:
         # Check the requests history to detect 301/302 redirections.
@@ -132,40 +221,74 @@ class RestfulClient:
         files: Optional[Dict[str, Any]] = None,
         post_data: Optional[Union[Dict[str, Any], bytes]] = None,
         raw: bool = False,
-    ) -> Tuple[
-        Optional[Union[Dict[str, Any], bytes]],
-        Optional[Union[Dict[str, Any], MultipartEncoder]],
-        str,
-    ]:
+    ) -> Tuple[Union[Dict[str, Any], bytes, MultipartEncoder], str]:
         if files:
             if post_data is None:
                 post_data = {}
             else:
                 # booleans does not exists for data (neither for
                 # MultipartEncoder): cast to string int to avoid: 'bool' object
-                # has no attribute 'encode'
+                # has no attribute 'encode'. A new dict is built, so the
+                # caller's data is left untouched.
                 if TYPE_CHECKING:
                     assert isinstance(post_data, dict)
-                for k, v in post_data.items():
-                    if isinstance(v, bool):
-                        post_data[k] = str(int(v))
+                post_data = {
+                    k: str(int(v)) if isinstance(v, bool) else v
+                    for k, v in post_data.items()
+                }
 
-            for k, v in files.items():
-                post_data[k] = v
+            post_data.update(files)
 
             data = MultipartEncoder(post_data)
-            return (None, data, data.content_type)
+            return (data, data.content_type)
 
         if raw and post_data:
-            return (None, post_data, "application/octet-stream")
+            return (post_data, "application/octet-stream")
 
         if post_data is None:
             post_data = {}
 
-        return (post_data, None, "application/json")
+        # The body is serialized here once, rather than by requests on each
+        # retry.
+        return (utils.json_dumps(post_data), "application/json")
+
+    def _get_cache_key(
+        self, path: str, query_data: Dict[str, Any], kwargs: Dict[str, Any]
+    ) -> Optional[Hashable]:
+        params = {**query_data, **kwargs}
+        # Requests differing only by their headers may get different
+        # responses, e.g. with another Accept header.
+        headers = params.pop("headers", None) or {}
+        key = (
+            self._build_url(path),
+            tuple(
+                sorted(
+                    (k, tuple(v) if isinstance(v, list) else v)
+                    for k, v in params.items()
+                )
+            ),
+            tuple(sorted((k.lower(), v) for k, v in headers.items())),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @staticmethod
+    def _get_validators(result: requests.Response) -> Dict[str, str]:
+        """Returns the conditional request headers revalidating result."""
+        validators = {}
+        etag = result.headers.get("ETag")
+        if etag is not None:
+            validators["If-None-Match"] = etag
+        last_modified = result.headers.get("Last-Modified")
+        if last_modified is not None:
+            validators["If-Modified-Since"] = last_modified
+        return validators
 
     def _load_json(self, result: requests.Response) -> Dict[str, Any]:
-        return result.json()
+        return utils.json_loads(result.content)
 
     def http_request(
         self,
@@ -180,6 +303,8 @@ class RestfulClient:
         obey_rate_limit: bool = True,
         retry_transient_errors: Optional[bool] = None,
         max_retries: int = 10,
+        headers: Optional[Dict[str, str]] = None,
+        allow_not_modified: bool = False,
         **kwargs: Any,
     ) -> requests.Response:
         """Make an HTTP request to the server.
@@ -200,6 +325,10 @@ class RestfulClient:
                 or 52x responses. Defaults to False.
             max_retries: Max retries after 429 or transient errors,
                                set to -1 to retry forever. Defaults to 10.
+            headers: Extra HTTP headers to send with the request
+            allow_not_modified: Whether a 304 Not Modified response is
+                returned rather than raised. Only set for conditional
+                requests whose caller holds the entity to reuse.
             **kwargs: Extra options to send to the server (e.g. sudo)
 
         Returns:
@@ -212,13 +341,20 @@ class RestfulClient:
         raw_url = self._build_url(path)
 
         # parse user-provided URL params to ensure we don't add our own
-        # duplicates
-        parsed = parse.urlparse(raw_url)
-        params = parse.parse_qs(parsed.query)
-        url = parse.urlunparse(parsed._replace(query=""))
+        # duplicates. Most paths carry no query string at all, and need no
+        # parsing.
+        if "?" in raw_url:
+            parsed = parse.urlparse(raw_url)
+            params = parse.parse_qs(parsed.query)
+            url = parse.urlunparse(parsed._replace(query=""))
+        else:
+            params = {}
+            url = raw_url
 
-        utils.copy_dict(src=query_data, dest=params)
-        utils.copy_dict(src=kwargs, dest=params)
+        if query_data:
+            utils.copy_dict(src=query_data, dest=params)
+        if kwargs:
+            utils.copy_dict(src=kwargs, dest=params)
 
         auth = self._auth
         verify = self._ssl_verify
@@ -230,11 +366,12 @@ class RestfulClient:
             retry_transient_errors = self._retry_transient_errors
 
         # We need to deal with json vs. data when uploading files
-        headers = self._headers.copy()
-        json, data, content_type = self._prepare_send_data(
-            files, post_data, raw
-        )
-        headers["Content-Type"] = content_type
+        data, content_type = self._prepare_send_data(files, post_data, raw)
+        headers = {
+            **self._headers,
+            **(headers or {}),
+            "Content-Type": content_type,
+        }
 
         cur_retries = 0
         while True:
@@ -242,7 +379,6 @@ class RestfulClient:
                 result = self._session.request(
                     method=verb,
                     url=url,
-                    json=json,
                     data=data,
                     params=params,
                     timeout=timeout,
@@ -258,7 +394,7 @@ class RestfulClient:
                 if retry_transient_errors and (
                     max_retries == -1 or cur_retries < max_retries
                 ):
-                    wait_time = 2**cur_retries * 0.1
+                    wait_time = self._backoff(cur_retries)
                     cur_retries += 1
                     time.sleep(wait_time)
                     continue
@@ -269,6 +405,8 @@ class RestfulClient:
 
             if 200 <= result.status_code < 300:
                 return result
+            if result.status_code == 304 and allow_not_modified:
+                return result
 
             if (429 == result.status_code and obey_rate_limit) or (
                 result.status_code in RETRYABLE_TRANSIENT_ERROR_CODES
@@ -277,14 +415,16 @@ class RestfulClient:
                 # Response headers documentation:
                 # https://docs.gitlab.com/ee/user/admin_area/settings/user_and_ip_rate_limits.html#response-headers
                 if max_retries == -1 or cur_retries < max_retries:
-                    wait_time = 2**cur_retries * 0.1
-                    if "Retry-After" in result.headers:
-                        wait_time = int(result.headers["Retry-After"])
-                    elif "RateLimit-Reset" in result.headers:
-                        wait_time = (
-                            int(result.headers["RateLimit-Reset"])
-                            - time.time()
-                        )
+                    retry_after = result.headers.get("Retry-After")
+                    reset = result.headers.get("RateLimit-Reset")
+                    if retry_after is not None:
+                        wait_time = int(retry_after)
+                    elif reset is not None:
+                        # RateLimit-Reset is an epoch timestamp, which may
+                        # already have passed.
+                        wait_time = max(int(reset) - time.time(), 0)
+                    else:
+                        wait_time = self._backoff(cur_retries)
                     cur_retries += 1
                     time.sleep(wait_time)
                     continue
@@ -311,6 +451,108 @@ class RestfulClient:
                 response_body=result.content,
             )
 
+    def _coalesced_get(
+        self,
+        path: str,
+        query_data: Dict[str, Any],
+        cache_key: Hashable,
+        kwargs: Dict[str, Any],
+    ) -> requests.Response:
+        """Sends a GET request, sharing the response with identical GET
+        requests made concurrently.
+
+        The first caller sends the request; callers arriving while it is on
+        the wire wait for its response, or its exception, instead of sending
+        their own. Each caller parses the shared response on its own.
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(cache_key)
+            owner = future is None
+            if owner:
+                future = self._inflight[cache_key] = Future()
+        if TYPE_CHECKING:
+            assert future is not None
+        if not owner:
+            return future.result()
+
+        try:
+            result = self._get_response(
+                path, query_data, False, cache_key, **kwargs
+            )
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[cache_key]
+        return result
+
+    def _get_response(
+        self,
+        path: str,
+        query_data: Dict[str, Any],
+        streamed: bool,
+        cache_key: Optional[Hashable],
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Sends a GET request, revalidating the cached response if any."""
+        headers = kwargs.pop("headers", None)
+        cached = None
+        if cache_key is not None and self._etag_cache is not None:
+            cached = self._etag_cache.get(cache_key)
+            if cached is not None:
+                headers = {**(headers or {}), **cached[0]}
+
+        result = self.http_request(
+            "get",
+            path,
+            query_data=query_data,
+            streamed=streamed,
+            headers=headers,
+            allow_not_modified=cached is not None,
+            **kwargs,
+        )
+
+        if cache_key is not None and self._etag_cache is not None:
+            if result.status_code == 304 and cached is not None:
+                # The body is parsed again by each caller, so callers never
+                # share mutable data through the cache.
+                result = cached[1]
+            else:
+                validators = self._get_validators(result)
+                if validators:
+                    self._etag_cache[cache_key] = (validators, result)
+        return result
+
+    def _send_get(
+        self,
+        path: str,
+        query_data: Dict[str, Any],
+        streamed: bool,
+        raw: bool,
+        kwargs: Dict[str, Any],
+    ) -> requests.Response:
+        """Sends a GET request for http_get() and http_list().
+
+        Requests whose body is parsed as json go through the response cache
+        and, if enabled, are shared with identical requests made
+        concurrently.
+        """
+        cache_key = None
+        if (
+            not streamed
+            and not raw
+            and (self._etag_cache is not None or self._coalesce_gets)
+        ):
+            cache_key = self._get_cache_key(path, query_data, kwargs)
+        if cache_key is not None and self._coalesce_gets:
+            return self._coalesced_get(path, query_data, cache_key, kwargs)
+        return self._get_response(
+            path, query_data, streamed, cache_key, **kwargs
+        )
+
     def http_get(
         self,
         path: str,
@@ -321,6 +563,9 @@ class RestfulClient:
     ) -> Union[Dict[str, Any], requests.Response]:
         """Make a GET request to the server.
 
+        With ``coalesce_gets``, identical requests made concurrently from
+        several threads are sent only once, unless streamed or raw.
+
         Args:
             path: Path or full URL to query
             query_data: Data to send as query parameters
@@ -338,15 +583,9 @@ class RestfulClient:
             RestfulParsingError: If the json data could not be parsed
         """
         query_data = query_data or {}
-        result = self.http_request(
-            "get", path, query_data=query_data, streamed=streamed, **kwargs
-        )
+        result = self._send_get(path, query_data, streamed, raw, kwargs)
 
-        if (
-            result.headers["Content-Type"].split(';')[0] == "application/json"
-            and not streamed
-            and not raw
-        ):
+        if not streamed and not raw and _is_json(result):
             try:
                 json_result = self._load_json(result)
                 if TYPE_CHECKING:
@@ -400,10 +639,7 @@ class RestfulClient:
             **kwargs,
         )
         try:
-            if (
-                result.headers["Content-Type"].split(';')[0]
-                == "application/json"
-            ):
+            if _is_json(result):
                 json_result = self._load_json(result)
                 if TYPE_CHECKING:
                     assert isinstance(json_result, dict)
@@ -499,12 +735,42 @@ class RestfulClient:
             RestfulHttpError: When the return code is not 2xx
             RestfulParsingError: If the json data could not be parsed
         """
-        url = self._build_url(path)
-
-        result = self.http_request("get", url, query_data=query_data, **kwargs)
+        result = self._send_get(path, query_data or {}, False, False, kwargs)
         try:
             return self._load_json(result)
         except Exception as e:
             raise exc.RestfulParsingError(
                 error_message="Failed to parse the server message"
             ) from e
+
+    def http_list_many(
+        self,
+        paths: Iterable[str],
+        *,
+        max_workers: int = 8,
+        **kwargs: Any,
+    ) -> List[List[Dict[str, Any]]]:
+        """Make concurrent list-oriented GET requests to the server.
+
+        The requests share the client's HTTP session, so they reuse its
+        pooled keep-alive connections. Keep ``max_workers`` within the pool
+        size of the session.
+
+        Args:
+            paths: Paths or full URLs to query
+            max_workers: Maximum number of requests in flight
+            **kwargs: Options passed to each :meth:`http_list` call
+
+        Returns:
+            The result of :meth:`http_list` for each path, in the order of
+            ``paths``.
+
+        Raises:
+            RestfulHttpError: When a return code is not 2xx
+            RestfulParsingError: If the json data could not be parsed
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda path: self.http_list(path, **kwargs), paths
+            )
+            return list(results)
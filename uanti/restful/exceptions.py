@@ -22,7 +22,6 @@ from typing import (
     cast,
     Optional,
     Type,
-    TYPE_CHECKING,
     TypeVar,
     Union,
 )
@@ -56,15 +55,11 @@ class RestfulError(Exception):
         # Full http response
         self.response_body = response_body
         # Parsed error message from gitlab
-        try:
-            # if we receive str/bytes we try to convert to unicode/str to have
-            # consistent message types (see #616)
-            if TYPE_CHECKING:
-                assert isinstance(error_message, bytes)
-            self.error_message = error_message.decode()
-        except Exception:
-            if TYPE_CHECKING:
-                assert isinstance(error_message, str)
+        # if we receive str/bytes we try to convert to unicode/str to have
+        # consistent message types (see #616)
+        if isinstance(error_message, (bytes, bytearray)):
+            self.error_message = error_message.decode("utf-8", "replace")
+        else:
             self.error_message = error_message
 
     def __str__(self) -> str:
@@ -42,6 +42,8 @@ __all__ = [
 
 
 class CreateMixin(base.RestfulManager):
+    __slots__ = ()
+
     _computed_path: Optional[str]
     _from_parent_attrs: Dict[str, Any]
     _obj_cls: Optional[Type[base.RestfulObject]]
@@ -85,12 +87,15 @@ class CreateMixin(base.RestfulManager):
 
 
 class DeleteMixin(base.RestfulManager):
+    __slots__ = ()
+
     _computed_path: Optional[str]
     _from_parent_attrs: Dict[str, Any]
     _obj_cls: Optional[Type[base.RestfulObject]]
     _parent: Optional[base.RestfulObject]
     _parent_attrs: Dict[str, Any]
     _path: Optional[str]
+    _stripped_path: Optional[str]
     _client: client.RestfulClient
 
     @exc.on_http_error(exc.RestfulDeleteError)
@@ -110,7 +115,11 @@ class DeleteMixin(base.RestfulManager):
         if id is None:
             path = self.path
         else:
-            path = f"{self.path.rstrip('/')}/{utils.EncodedId(id)}"
+            if TYPE_CHECKING:
+                assert self._stripped_path is not None
+            # Concatenation skips the __format__ call an f-string makes on
+            # the EncodedId str subclass.
+            path = self._stripped_path + "/" + utils.EncodedId(id)
 
         if TYPE_CHECKING:
             assert path is not None
@@ -118,12 +127,15 @@ class DeleteMixin(base.RestfulManager):
 
 
 class GetMixin(base.RestfulManager):
+    __slots__ = ()
+
     _from_parent_attrs: Dict[str, Any]
     _obj_cls: Optional[Type[base.RestfulObject]]
     _optional_get_attrs: Tuple[str, ...] = ()
     _parent: Optional[base.RestfulObject]
     _parent_attrs: Dict[str, Any]
     _path: Optional[str]
+    _stripped_path: Optional[str]
     _client: client.RestfulClient
 
     @exc.on_http_error(exc.RestfulGetError)
@@ -143,7 +155,11 @@ class GetMixin(base.RestfulManager):
         """
         if isinstance(id, str):
             id = utils.EncodedId(id)
-        path = f"{self.path.rstrip('/')}/{id}"
+        else:
+            id = str(id)
+        if TYPE_CHECKING:
+            assert self._stripped_path is not None
+        path = self._stripped_path + "/" + id
         if TYPE_CHECKING:
             assert self._obj_cls is not None
         server_data = self._client.http_get(path, **kwargs)
@@ -153,6 +169,8 @@ class GetMixin(base.RestfulManager):
 
 
 class GetWithoutIdMixin(base.RestfulManager):
+    __slots__ = ()
+
     _computed_path: Optional[str]
     _from_parent_attrs: Dict[str, Any]
     _obj_cls: Optional[Type[base.RestfulObject]]
@@ -160,6 +178,7 @@ class GetWithoutIdMixin(base.RestfulManager):
     _parent: Optional[base.RestfulObject]
     _parent_attrs: Dict[str, Any]
     _path: Optional[str]
+    _stripped_path: Optional[str]
     _client: client.RestfulClient
 
     @exc.on_http_error(exc.RestfulGetError)
@@ -186,6 +205,8 @@ class GetWithoutIdMixin(base.RestfulManager):
 
 
 class ListFromDictMixin(base.RestfulManager):
+    __slots__ = ()
+
     _from_parent_attrs: Dict[str, Any]
     _list_filters: Tuple[str, ...] = ()
     _obj_cls: Optional[Type[base.RestfulObject]]
@@ -220,13 +241,17 @@ class ListFromDictMixin(base.RestfulManager):
         obj = self._client.http_list(path, **kwargs)
         if TYPE_CHECKING:
             assert not isinstance(obj, requests.Response)
+        obj_cls = self._obj_cls
         if copy_id_attr:
-            for k, v in obj.items():
-                v[copy_id_attr] = k
-        return [self._obj_cls(self, v) for _, v in obj.items()]
+            return [
+                obj_cls(self, {**v, copy_id_attr: k}) for k, v in obj.items()
+            ]
+        return [obj_cls(self, v) for v in obj.values()]
 
 
 class ListMixin(base.RestfulManager):
+    __slots__ = ()
+
     _from_parent_attrs: Dict[str, Any]
     _list_filters: Tuple[str, ...] = ()
     _obj_cls: Optional[Type[base.RestfulObject]]
@@ -258,4 +283,5 @@ class ListMixin(base.RestfulManager):
         obj = self._client.http_list(path, **kwargs)
         if TYPE_CHECKING:
             assert not isinstance(obj, list)
-        return [self._obj_cls(self, item) for item in obj]
+        obj_cls = self._obj_cls
+        return [obj_cls(self, item) for item in obj]
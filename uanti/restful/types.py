@@ -16,7 +16,7 @@
 # along with uanti. If not, see <http://www.gnu.org/licenses/>.
 
 import dataclasses
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 
 @dataclasses.dataclass(frozen=True)
@@ -24,6 +24,17 @@ class RequiredOptional:
     required: Tuple[str, ...] = ()
     optional: Tuple[str, ...] = ()
     exclusive: Tuple[str, ...] = ()
+    _required_set: FrozenSet[str] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    _exclusive_set: FrozenSet[str] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # Precomputed for set operations in validate_attrs()
+        object.__setattr__(self, "_required_set", frozenset(self.required))
+        object.__setattr__(self, "_exclusive_set", frozenset(self.exclusive))
 
     def validate_attrs(
         self,
@@ -31,25 +42,24 @@ class RequiredOptional:
         data: Dict[str, Any],
         excludes: Optional[List[str]] = None,
     ) -> None:
-        if excludes is None:
-            excludes = []
-
         if self.required:
-            required = [k for k in self.required if k not in excludes]
-            missing = [attr for attr in required if attr not in data]
-            if missing:
+            missing_set = self._required_set.difference(data, excludes or ())
+            if missing_set:
+                # Reported in declaration order
+                missing = [k for k in self.required if k in missing_set]
                 raise AttributeError(
                     f"Missing attributes: {', '.join(missing)}"
                 )
 
         if self.exclusive:
-            exclusives = [attr for attr in data if attr in self.exclusive]
-            if len(exclusives) > 1:
+            found = self._exclusive_set.intersection(data)
+            if len(found) > 1:
+                exclusives = [attr for attr in data if attr in found]
                 raise AttributeError(
                     f"Provide only one of these attributes: "
                     f"{', '.join(exclusives)}"
                 )
-            if not exclusives:
+            if not found:
                 raise AttributeError(
                     f"Must provide one of these attributes: "
                     f"{', '.join(self.exclusive)}"
@@ -14,16 +14,31 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with uanti. If not, see <http://www.gnu.org/licenses/>.
 
-from typing import Any, Dict, Union
+from typing import Any, Dict, Hashable, Union
 
+import collections
+import functools
+import json
+import re
+import threading
 import urllib.parse
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
 
 def copy_dict(
     *,
     src: Dict[str, Any],
     dest: Dict[str, Any],
 ) -> None:
+    if not any(isinstance(v, dict) for v in src.values()):
+        # Plain values are copied over as is, in one call.
+        dest.update(src)
+        return
+
     for k, v in src.items():
         if isinstance(v, dict):
             # NOTE(jlvillal): This provides some support for the `hash` type
@@ -31,12 +46,47 @@ def copy_dict(
             # Transform dict values to new attributes. For example:
             # custom_attributes: {'foo', 'bar'} =>
             #   "custom_attributes['foo']": "bar"
-            for dict_k, dict_v in v.items():
-                dest[f"{k}[{dict_k}]"] = dict_v
+            dest.update(
+                (f"{k}[{dict_k}]", dict_v) for dict_k, dict_v in v.items()
+            )
         else:
             dest[k] = v
 
 
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Decodes a JSON document, with orjson when it is installed.
+
+    JSON is always UTF-8 encoded, and both parsers accept raw bytes, so
+    response bodies can be passed in as is without being decoded first.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects some non-standard forms, e.g. NaN, which the
+            # stdlib parser still accepts.
+            pass
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encodes obj as a UTF-8 JSON document.
+
+    NaN and infinite floats are rejected rather than sent as non-standard
+    JSON, as requests does.
+    """
+    return json.dumps(obj, allow_nan=False).encode("utf-8")
+
+
+# Characters urllib.parse.quote() never escapes.
+_URL_SAFE_RE = re.compile(r"[A-Za-z0-9_.~-]*")
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote_id(value: str) -> str:
+    return urllib.parse.quote(value, safe="")
+
+
 class EncodedId(str):
     """A custom `str` class that will return the URL-encoded value of the
     string.
@@ -59,6 +109,57 @@ class EncodedId(str):
 
         if not isinstance(value, (int, str)):
             raise TypeError(f"Unsupported type received: {type(value)}")
-        if isinstance(value, str):
-            value = urllib.parse.quote(value, safe="")
+        # Most IDs need no escaping at all, and are used as is.
+        if isinstance(value, str) and not _URL_SAFE_RE.fullmatch(value):
+            value = _quote_id(value)
         return super().__new__(cls, value)
+
+
+@functools.lru_cache(maxsize=4096)
+def _unquote_id(value: str) -> str:
+    return urllib.parse.unquote(value)
+
+
+def unquote_id(value: str) -> str:
+    """Returns the URL-decoded value of an ID string sent by the server.
+
+    Most IDs contain no percent-escapes at all, so they are returned as is
+    without going through the decoder. Decoded values are cached, as the
+    same IDs tend to show up repeatedly across queries.
+    """
+    if "%" not in value:
+        return value
+    return _unquote_id(value)
+
+
+class LRUCache:
+    """A size-bounded, thread-safe mapping.
+
+    Once ``maxsize`` entries are stored, inserting a new one evicts the
+    least recently used entry.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._data: "collections.OrderedDict[Hashable, Any]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)